@@ -1,16 +1,26 @@
 import os
+import re
+import asyncio
 import json
 import shutil
 import tempfile
+import zipfile
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
-from bs4 import BeautifulSoup
-from shapely import union_all
-from shapely.ops import unary_union
+from functools import lru_cache
+import shapely
+from shapely.geometry import box
 
+import aiohttp
 import geopandas as gpd
+from geopandas.io.arrow import _geopandas_to_arrow
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyogrio
+import pyproj
 import requests
 
 # --- Configuration ---
@@ -23,6 +33,22 @@ ZIPPED_DIR = Path(os.getenv("ZIPPED_DIR", "zips"))
 SHAPEFILE_BASE_URL = os.getenv("SHAPEFILE_BASE_URL", "https://download.dmi.dk/public/ICESERVICE/SIGRID3/")
 ASSET_BASE_URL_FGB = os.getenv("ASSET_BASE_URL_FGB", "https://your-bucket.example.com/daily")
 ASSET_BASE_URL_ZIP = os.getenv("ASSET_BASE_URL_ZIP", "https://your-bucket.example.com/zips")
+DL_WORKERS = int(os.getenv("DL_WORKERS", "32"))
+ZIP_COMPRESSION = os.getenv("ZIP_COMPRESSION", "stored")
+TMP_RAMDISK = os.getenv("TMP_RAMDISK", "/dev/shm")
+TMP_RAMDISK_MB_PER_FOLDER = int(os.getenv("TMP_RAMDISK_MB_PER_FOLDER", "64"))
+
+# Zip compression options, shapefile parts are compact binaries so storing
+# them is much cheaper than deflating
+ZIP_COMPRESSION_OPTIONS = {
+    "stored": (zipfile.ZIP_STORED, None),
+    "deflated": (zipfile.ZIP_DEFLATED, 1),
+}
+if ZIP_COMPRESSION not in ZIP_COMPRESSION_OPTIONS:
+    raise ValueError(
+        f"Invalid ZIP_COMPRESSION {ZIP_COMPRESSION!r}, "
+        f"expected one of {sorted(ZIP_COMPRESSION_OPTIONS)}"
+    )
 
 # Get current year and add it to shapefile base URL
 SYNC_YEAR = os.getenv("SYNC_YEAR", str(datetime.now().year))
@@ -34,35 +60,69 @@ print(f"Using config:\n"
       f"  ZIP_INDEX_PATH: {ZIP_PARQUET_PATH}\n"
       f"  SHAPEFILE_REMOTE_BASE_URL: {SHAPEFILE_BASE_URL}\n"
       f"  DAILY_ITEMS_BASE_URL: {ASSET_BASE_URL_FGB}\n"
-      f"  ZIP_ITEMS_BASE_URL: {ASSET_BASE_URL_ZIP}")
+      f"  ZIP_ITEMS_BASE_URL: {ASSET_BASE_URL_ZIP}\n"
+      f"  DL_WORKERS: {DL_WORKERS}\n"
+      f"  ZIP_COMPRESSION: {ZIP_COMPRESSION}")
 
 FLATGEOBUF_DIR.mkdir(exist_ok=True, parents=True)
 ZIPPED_DIR.mkdir(exist_ok=True, parents=True)
 
+def select_temp_dir():
+    # Prefer a RAM backed tmpfs for intermediate shapefiles if it has room for
+    # every folder that can be in flight. Checked per folder, so a filling
+    # tmpfs falls back to the default temp dir. Note tmpfs pages count
+    # against the container's memory limit.
+    try:
+        stats = os.statvfs(TMP_RAMDISK)
+    except (OSError, AttributeError):
+        return None
+    free_mb = stats.f_bavail * stats.f_frsize / (1024 * 1024)
+    if free_mb < DL_WORKERS * TMP_RAMDISK_MB_PER_FOLDER or not os.access(TMP_RAMDISK, os.W_OK):
+        return None
+    return TMP_RAMDISK
+
+print(f"Using temporary directory: {select_temp_dir() or tempfile.gettempdir()}")
+
+# Use pyogrio's bulk GDAL bindings instead of fiona for vector I/O
+gpd.options.io_engine = "pyogrio"
+
+# STAC geometries are always in WGS84
+WGS84 = pyproj.CRS.from_epsg(4326)
+
+# Fixed Arrow types for the STAC columns so every partition file shares one
+# schema, whatever assets and links the rows in it happen to have
+ASSET_TYPE = pa.struct([
+    ("href", pa.string()),
+    ("type", pa.string()),
+    ("roles", pa.list_(pa.string())),
+])
+ASSETS_TYPE = pa.map_(pa.string(), ASSET_TYPE)
+LINKS_TYPE = pa.list_(pa.struct([
+    ("rel", pa.string()),
+    ("href", pa.string()),
+    ("type", pa.string()),
+    ("asset:keys", pa.list_(pa.string())),
+]))
+
+# Download settings for the async HTTP client
+HTTP_CONNECTION_LIMIT = 64
+HTTP_KEEPALIVE_TIMEOUT = 30
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.3
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+# Links in the remote Apache directory index pages
+FOLDER_LINK_RE = re.compile(r'href="(\d{8}[^"/?#]*)/"')
+FILE_LINK_RE = re.compile(r'href="([^"/?#]+)"')
+
 def fetch_folder_list_from_remote(base_url):
     print(f"Fetching folder list from remote: {base_url}")
-    response = requests.get(base_url)
+    response = requests.get(base_url, timeout=30)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, 'html.parser')
-    folder_names = []
-
-    for link in soup.find_all('a'):
-        href = link.get('href')
-
-        if (
-            not href or
-            href in ('../', '/') or
-            href.startswith('public') or
-            href.startswith('/')  # Avoid absolute paths like /public/...
-        ):
-            continue
-
-        if href.endswith('/'):
-            folder = href.rstrip('/')
-            folder_names.append(folder)
-
-    folder_names = sorted(set(folder_names))
+    # Only date-prefixed folder links, e.g. href="202501011005_CentralWest_RIC/"
+    folder_names = sorted(set(FOLDER_LINK_RE.findall(response.text)))
     return {"list": folder_names}
 
 def extract_date(folder_name):
@@ -71,51 +131,233 @@ def extract_date(folder_name):
     except ValueError:
         return None
 
-def download_shapefile_folder(folder_name: str, destination: Path):
+async def with_retries(url, request):
+    # Retry connection errors and timeouts with exponential backoff
+    for attempt in range(HTTP_RETRIES + 1):
+        try:
+            return await request()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == HTTP_RETRIES:
+                print(f"❌ Request failed: {url}: {e}")
+                return None
+            await asyncio.sleep(HTTP_BACKOFF_FACTOR * 2 ** attempt)
+
+async def fetch_folder_index(session, folder_name):
+    # Returns the set of file extensions listed in the remote folder index,
+    # or None if the index could not be fetched
     base_url = f"{SHAPEFILE_BASE_URL}/{folder_name}/"
-    expected_exts = [".shp", ".shx", ".dbf", ".prj", ".cpg"]
-    downloaded = False
 
-    for ext in expected_exts:
-        url = f"{base_url}{folder_name}{ext}"
-        local_path = destination / f"{folder_name}{ext}"
-        r = requests.get(url)
-        if r.status_code == 200:
+    async def request():
+        async with session.get(base_url) as r:
+            if r.status != 200:
+                print(f"⚠️ Could not fetch index for {folder_name}: HTTP {r.status}")
+                return None
+            return await r.text()
+
+    text = await with_retries(base_url, request)
+    if text is None:
+        return None
+
+    available_exts = set()
+    for href in FILE_LINK_RE.findall(text):
+        if Path(href).stem == folder_name:
+            available_exts.add(Path(href).suffix.lower())
+    return available_exts
+
+async def _fetch_one(session, url, local_path):
+    async def request():
+        async with session.get(url) as r:
+            if r.status != 200:
+                print(f"⚠️ Missing: {url}")
+                return False
             with open(local_path, "wb") as f:
-                f.write(r.content)
-            downloaded = True
-        else:
-            print(f"⚠️ Missing: {url}")
-    return downloaded
+                async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        return True
+
+    return bool(await with_retries(url, request))
+
+async def download_shapefile_folder(session, folder_name: str, destination: Path):
+    base_url = f"{SHAPEFILE_BASE_URL}/{folder_name}/"
+    expected_exts = [".shp", ".shx", ".dbf", ".prj", ".cpg"]
+
+    # Only request files the remote folder actually lists
+    available_exts = await fetch_folder_index(session, folder_name)
+    if available_exts is not None:
+        for ext in expected_exts:
+            if ext not in available_exts:
+                print(f"⚠️ Missing: {base_url}{folder_name}{ext}")
+        expected_exts = [ext for ext in expected_exts if ext in available_exts]
+
+    # Fetch all extensions of the folder concurrently
+    results = await asyncio.gather(*[
+        _fetch_one(session, f"{base_url}{folder_name}{ext}", destination / f"{folder_name}{ext}")
+        for ext in expected_exts
+    ])
+    return any(results)
 
 def zip_folder(source_folder: Path, zip_path: Path):
     print(f"Zipping folder {source_folder} to {zip_path}")
-    shutil.make_archive(str(zip_path).replace(".zip", ""), 'zip', root_dir=source_folder)
+    compression, compresslevel = ZIP_COMPRESSION_OPTIONS[ZIP_COMPRESSION]
+    with zipfile.ZipFile(zip_path, "w", compression, compresslevel=compresslevel) as zf:
+        for file_path in sorted(source_folder.iterdir()):
+            zf.write(file_path, arcname=file_path.name)
 
 def convert_to_flatgeobuf(shp_folder: Path, folder_name: str, out_path: Path):
     print(f"Converting {folder_name} shapefile to FlatGeobuf at {out_path}")
     shp_file = shp_folder / f"{folder_name}.shp"
     if not shp_file.exists():
         print(f"❌ No .shp file found for {folder_name}")
-        return False
-    gdf = gpd.read_file(shp_file)
-    gdf.to_file(out_path, driver="FlatGeobuf")
-    return True
-
-def load_existing(path):
-    if os.path.exists(path):
-        return gpd.read_parquet(path)
+        return False, None
+    gdf = gpd.read_file(shp_file, engine="pyogrio", use_arrow=True)
+    pyogrio.write_dataframe(gdf, out_path, driver="FlatGeobuf")
+    return True, gdf
+
+@lru_cache(maxsize=None)
+def transformer_to_wgs84(crs):
+    return pyproj.Transformer.from_crs(crs, WGS84, always_xy=True)
+
+def wgs84_bounds(gdf):
+    # Reproject only the bounds, reusing one transformer per source CRS
+    bounds = gdf.total_bounds
+    if gdf.crs is None or gdf.crs == WGS84:
+        return bounds
+    return transformer_to_wgs84(gdf.crs).transform_bounds(*bounds)
+
+def empty_items():
     return gpd.GeoDataFrame(columns=[
         "id", "type", "stac_version", "datetime",
         "geometry", "bbox", "assets", "links"], crs="EPSG:4326"
     )
 
+def load_existing_ids(path):
+    # Only read the id column of the dataset
+    if os.path.exists(path):
+        return frozenset(pq.read_table(path, columns=["id"]).column("id").to_pylist())
+    return frozenset()
+
+def partition_path(base_dir, date):
+    return Path(base_dir) / f"year={date.year}" / f"month={date.month}"
+
+def load_partitions(base_dir, datetimes):
+    # Read only the year/month partitions covering the given datetimes
+    dirs = sorted({partition_path(base_dir, d) for d in pd.to_datetime(datetimes)})
+    existing = [read_geoparquet(d) for d in dirs if d.is_dir()]
+    if not existing:
+        return empty_items()
+    return pd.concat(existing, ignore_index=True)
+
+def write_partitioned(gdf, base_dir, basename):
+    # Write one file per year/month partition, other files in it are kept
+    out_dirs = pd.to_datetime(gdf["datetime"]).map(lambda d: partition_path(base_dir, d))
+    for out_dir, part in gdf.groupby(out_dirs):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a hidden temp file and swap it in, so hardlinked published
+        # copies keep the previous file instead of being rewritten in place
+        tmp_path = out_dir / f".{basename}.tmp"
+        write_geoparquet(part, tmp_path)
+        os.replace(tmp_path, out_dir / basename)
+
+def check_dataset_assets(base_dir, gdf):
+    # Read the whole dataset back and make sure the written items kept all
+    # their assets, partitions must share one readable schema for that
+    table = pq.read_table(base_dir, columns=["id", "assets"])
+    stored = dict(zip(
+        table.column("id").to_pylist(),
+        [len(assets) for assets in table.column("assets").to_pylist()]
+    ))
+    for item_id, assets in zip(gdf["id"], gdf["assets"]):
+        if stored.get(item_id) != len(_assets_entries(assets)):
+            raise RuntimeError(f"Item {item_id} in {base_dir} does not match the written assets")
+
+def migrate_to_partitions(path):
+    # Convert a legacy single-file parquet into the partitioned layout
+    path = Path(path)
+    tmp_dir = path.with_name(f".{path.name}.migrating")
+    backup = path.with_name(f".{path.name}.legacy")
+
+    # Recover from a run interrupted while swapping the dataset into place
+    if backup.is_file():
+        if path.exists():
+            backup.unlink()
+        else:
+            os.replace(backup, path)
+
+    if not path.is_file():
+        return
+    print(f"Migrating {path} to partitioned dataset")
+    legacy = read_geoparquet(path)
+    # Write next to the legacy file first, then keep it as a backup until
+    # the partitioned copy is in place
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    write_partitioned(legacy, tmp_dir, "part-0.parquet")
+    os.replace(path, backup)
+    os.replace(tmp_dir, path)
+    backup.unlink()
+
+def _string_list(values):
+    return [str(v) for v in values] if values is not None else None
+
+def _assets_entries(assets):
+    if not isinstance(assets, dict):
+        return []
+    return [
+        (key, {
+            "href": asset.get("href"),
+            "type": asset.get("type"),
+            "roles": _string_list(asset.get("roles"))
+        })
+        for key, asset in assets.items() if asset  # filter out nulls
+    ]
+
+def _links_entries(links):
+    if links is None:
+        return []
+    return [
+        {
+            "rel": link.get("rel"),
+            "href": link.get("href"),
+            "type": link.get("type"),
+            "asset:keys": _string_list(link.get("asset:keys"))
+        }
+        for link in links
+    ]
+
+def read_geoparquet(path):
+    # Read the assets map back as plain dicts
+    return gpd.read_parquet(path, to_pandas_kwargs={"maps_as_pydicts": "strict"})
+
+def write_geoparquet(gdf, path):
+    # Store bbox as a covering {xmin, ymin, xmax, ymax} struct column so
+    # readers can prune rows with bbox predicate pushdown
+    table = _geopandas_to_arrow(
+        gdf.drop(columns=["bbox", "assets", "links"], errors="ignore"),
+        schema_version="1.1.0",
+        write_covering_bbox=True
+    )
+    # Append assets and links with their fixed Arrow types instead of
+    # inferring them from the rows in this file
+    table = table.append_column(
+        pa.field("assets", ASSETS_TYPE),
+        pa.array([_assets_entries(a) for a in gdf["assets"]], type=ASSETS_TYPE)
+    )
+    table = table.append_column(
+        pa.field("links", LINKS_TYPE),
+        pa.array([_links_entries(l) for l in gdf["links"]], type=LINKS_TYPE)
+    )
+    pq.write_table(table, path, compression="zstd", row_group_size=50_000)
+
+def bounds_envelope(geometries):
+    # Envelope of all geometries from their combined min/max bounds
+    bounds = shapely.bounds(np.asarray(geometries, dtype=object))
+    return box(bounds[:, 0].min(), bounds[:, 1].min(), bounds[:, 2].max(), bounds[:, 3].max())
+
 def create_stac_item(date, id, assets, asset_type):
     datetime_obj = pd.to_datetime(date)
 
-    # Union geometries and get envelope
+    # Envelope around all asset geometries
     geometries = [i["geometry"] for i in assets]
-    envelope = union_all(gpd.GeoSeries(geometries)).envelope
+    envelope = bounds_envelope(geometries)
 
     # Construct valid STAC Item dictionary
     stac_item = {
@@ -162,53 +404,145 @@ def add_style_link(row):
 
     return links
 
+def _asset_list(assets):
+    if not isinstance(assets, dict):
+        return []
+    return [asset for asset in assets.values() if asset]  # filter out nulls
+
+def _asset_href(asset):
+    return asset.get("href")
+
+def _link_list(links):
+    return list(links) if links is not None else []
+
+def _link_rel(link):
+    return link.get("rel")
+
+def _link_href(link):
+    return link.get("href")
+
+def _reindex_assets(assets):
+    # Reindex to asset_0, asset_1, ...
+    return {f"asset_{i}": asset for i, asset in enumerate(assets)}
+
 def merge_items_per_day(df):
-    merged_records = []
+    if df.empty:
+        return df
 
-    for item_id, group in df.groupby("id"):
-        # Merge geometries and using envelope around them
-        geoms = group["geometry"].tolist()
-        merged_geom = union_all(gpd.GeoSeries(geoms)).envelope
-
-        # Flatten and filter assets
-        flat_assets = []
-        for assets in group["assets"]:
-            if isinstance(assets, dict):
-                flat_assets.extend([
-                    asset for asset in assets.values() if asset  # filter out nulls
-                ])
-
-        # Reindex to asset_0, asset_1, ...
-        merged_assets = {
-            f"asset_{i}": asset for i, asset in enumerate(flat_assets)
-        }
+    # Merge geometries using envelope around them, from per-id min/max bounds
+    bounds = df.geometry.bounds.assign(id=df["id"].values).groupby("id").agg(
+        {"minx": "min", "miny": "min", "maxx": "max", "maxy": "max"}
+    )
 
-        # Merge links, deduplicating by (rel, href)
-        seen_links = set()
-        merged_links = []
-        for links in group["links"]:
-            for link in links:
-                key = (link.get("rel"), link.get("href"))
-                if key not in seen_links:
-                    seen_links.add(key)
-                    merged_links.append(link)
+    # Flatten and filter assets into one row per (id, asset), deduplicating by href
+    assets = df[["id"]].assign(asset=df["assets"].map(_asset_list)).explode("asset")
+    assets = assets.dropna(subset=["asset"])
+    assets = assets.assign(href=assets["asset"].map(_asset_href))
+    assets = assets.drop_duplicates(subset=["id", "href"])
+    merged_assets = assets.groupby("id")["asset"].agg(list).map(_reindex_assets)
+
+    # Merge links, deduplicating by (rel, href)
+    links = df[["id"]].assign(link=df["links"].map(_link_list)).explode("link")
+    links = links.dropna(subset=["link"])
+    links = links.assign(
+        rel=links["link"].map(_link_rel),
+        href=links["link"].map(_link_href)
+    )
+    links = links.drop_duplicates(subset=["id", "rel", "href"])
+    merged_links = links.groupby("id")["link"].agg(list)
 
-        # Use the first datetime (assumed same day)
-        date = pd.to_datetime(group["datetime"].iloc[0])
+    # Use the first datetime (assumed same day)
+    dates = pd.to_datetime(df.drop_duplicates(subset="id").set_index("id")["datetime"])
 
+    merged_records = []
+    for item_id, (minx, miny, maxx, maxy) in zip(bounds.index, bounds.to_numpy()):
+        merged_geom = box(minx, miny, maxx, maxy)
         merged_records.append({
             "type": "Feature",
             "stac_version": "1.0.0",
             "id": item_id,
             "geometry": merged_geom,
-            "bbox": list(gpd.GeoSeries([merged_geom]).total_bounds),
-            "datetime": date,
-            "assets": merged_assets,
-            "links": merged_links
+            "bbox": list(merged_geom.bounds),
+            "datetime": dates[item_id],
+            "assets": merged_assets.get(item_id, {}),
+            "links": merged_links.get(item_id, [])
         })
 
     return gpd.GeoDataFrame(merged_records, geometry="geometry", crs="EPSG:4326")
 
+def link_or_copy(src, dst):
+    # Hardlink when on the same filesystem, fall back to a real copy
+    Path(dst).unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+def publish_dataset(path, output_dir):
+    dst = output_dir / Path(path).name
+    # Replace a legacy single-file copy from before the partitioned layout
+    if dst.is_file():
+        dst.unlink()
+    shutil.copytree(path, dst, copy_function=link_or_copy, dirs_exist_ok=True)
+
+async def process_folder(session, semaphore, folder_name):
+    # Returns (zip STAC item, (date, grouped asset)) or (None, None) on failure
+    date = extract_date(folder_name)
+    if not date:
+        print(f"⚠️ Invalid date format in {folder_name}")
+        return None, None
+
+    # Create temporary folder for download (one per task so they don't collide)
+    async with semaphore:
+        with tempfile.TemporaryDirectory(dir=select_temp_dir()) as tmpdir:
+            tmp_path = Path(tmpdir)
+            success = await download_shapefile_folder(session, folder_name, tmp_path)
+            if not success:
+                print(f"❌ Skipping {folder_name} (download failed)")
+                return None, None
+
+            # Zip the folder and convert to flatgeobuf off the event loop
+            zip_path = ZIPPED_DIR / f"{folder_name}.zip"
+            await asyncio.to_thread(zip_folder, tmp_path, zip_path)
+
+            fgb_path = FLATGEOBUF_DIR / f"{folder_name}.fgb"
+            converted, gdf = await asyncio.to_thread(
+                convert_to_flatgeobuf, tmp_path, folder_name, fgb_path
+            )
+            if not converted:
+                return None, None
+
+        # Bounding box from the in-memory geometries
+        try:
+            minx, miny, maxx, maxy = wgs84_bounds(gdf)
+            geom = box(minx, miny, maxx, maxy)
+        except Exception as e:
+            print(f"❌ Error computing geometry for {folder_name}: {e}")
+            return None, None
+
+    zip_url = f"{ASSET_BASE_URL_ZIP}/{folder_name}.zip"
+    fgb_url = f"{ASSET_BASE_URL_FGB}/{folder_name}.fgb"
+
+    # Register in zip_items (single asset per item)
+    # we use download folder name as id
+    zip_record = create_stac_item(
+        date,
+        folder_name,
+        [{"url": zip_url, "geometry": geom}],
+        "application/zip"
+    )
+    return zip_record, (date, {"url": fgb_url, "geometry": geom})
+
+async def process_folders(folders):
+    # Process all folders concurrently, results are in input order
+    semaphore = asyncio.Semaphore(DL_WORKERS)
+    connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT, keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT) as session:
+        return await asyncio.gather(*[
+            process_folder(session, semaphore, folder_name) for folder_name in folders
+        ])
+
 def main(args):
     if len(args) > 1:
         json_path = Path(args[1])
@@ -226,77 +560,41 @@ def main(args):
     with open(json_path) as f:
         folders = json.load(f)["list"]
 
-    existing_zip_items = load_existing(ZIP_PARQUET_PATH)
-    existing_ids = set(existing_zip_items["id"])
+    # Parquet outputs are hive partitioned (year=/month=) datasets
+    migrate_to_partitions(ZIP_PARQUET_PATH)
+    migrate_to_partitions(GROUPED_PARQUET_PATH)
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    existing_ids = load_existing_ids(ZIP_PARQUET_PATH)
 
     new_zip_records = []
     grouped_items = defaultdict(list)
 
-    for folder_name in folders:
-        if folder_name in existing_ids:
-            continue
+    # Filter already processed folders before submitting any work
+    todo = [f for f in folders if f not in existing_ids]
+    print(f"Processing {len(todo)} new of {len(folders)} folders")
 
-        date = extract_date(folder_name)
-        if not date:
-            print(f"⚠️ Invalid date format in {folder_name}")
+    # Download and convert folders concurrently, collect results here
+    for zip_record, grouped_entry in asyncio.run(process_folders(todo)):
+        if zip_record is None:
             continue
+        new_zip_records.append(zip_record)
+        date, asset = grouped_entry
+        grouped_items[date].append(asset)
 
-        # Create temporary folder for download
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
-            success = download_shapefile_folder(folder_name, tmp_path)
-            if not success:
-                print(f"❌ Skipping {folder_name} (download failed)")
-                continue
-
-            # Zip the folder
-            zip_path = ZIPPED_DIR / f"{folder_name}.zip"
-            zip_folder(tmp_path, zip_path)
-
-            # Convert to flatgeobuf
-            fgb_path = FLATGEOBUF_DIR / f"{folder_name}.fgb"
-            if not convert_to_flatgeobuf(tmp_path, folder_name, fgb_path):
-                continue
-
-            # Read geometry
-            try:
-                gdf = gpd.read_file(fgb_path)
-                geom = union_all(gdf.geometry).envelope  # Bounding box
-            except Exception as e:
-                print(f"❌ Error reading {fgb_path}: {e}")
-                continue
-
-            zip_url = f"{ASSET_BASE_URL_ZIP}/{folder_name}.zip"
-            fgb_url = f"{ASSET_BASE_URL_FGB}/{folder_name}.fgb"
-
-            # Register in zip_items (single asset per item)
-            # we use download folder name as id
-            new_zip_records.append(
-                create_stac_item(
-                    date,
-                    folder_name,
-                    [{"url": zip_url, "geometry": geom}],
-                    "application/zip"
-                )
-            )
-            grouped_items[date].append(
-               {"url": fgb_url, "geometry": geom}
-            )
-
-    # Save updated zip_items.parquet
+    # Save new zip items as a new file in their year/month partitions
     if new_zip_records:
         zip_gdf = gpd.GeoDataFrame(new_zip_records, crs="EPSG:4326")
-        updated_zip = pd.concat([existing_zip_items, zip_gdf], ignore_index=True)
-        updated_zip.to_parquet(ZIP_PARQUET_PATH)
+        write_partitioned(zip_gdf, ZIP_PARQUET_PATH, f"part-{run_id}.parquet")
         print(f"✅ Updated {ZIP_PARQUET_PATH} with {len(new_zip_records)} items.")
     else:
         print("✅ No new zip items to add.")
-    # copy updated parquet file to zipped files output directory
-    print(f"Copying {ZIP_PARQUET_PATH} to {ZIPPED_DIR}")
-    shutil.copy(ZIP_PARQUET_PATH, ZIPPED_DIR)
+    # copy updated parquet dataset to zipped files output directory
+    if os.path.exists(ZIP_PARQUET_PATH):
+        print(f"Copying {ZIP_PARQUET_PATH} to {ZIPPED_DIR}")
+        publish_dataset(ZIP_PARQUET_PATH, ZIPPED_DIR)
 
     # Generate grouped_items.parquet (many assets per item)
-    existing_grouped = load_existing(GROUPED_PARQUET_PATH)
     grouped_records = []
 
     for date, assets in grouped_items.items():
@@ -304,23 +602,26 @@ def main(args):
             create_stac_item(date, date.strftime("%Y-%m-%d") , assets, "application/vnd.flatgeobuf")
         )
 
-    # updating grouped items parquet file
+    # updating grouped items partitions touched by this run
     if grouped_records:
         grouped_gdf = gpd.GeoDataFrame(grouped_records, crs="EPSG:4326")
+        existing_grouped = load_partitions(GROUPED_PARQUET_PATH, grouped_gdf["datetime"])
         updated_grouped = pd.concat([existing_grouped, grouped_gdf], ignore_index=True)
+        # Add style links to grouped items
+        updated_grouped["links"] = updated_grouped.apply(add_style_link, axis=1)
+        # make sure daily items are merged from previous runs
+        deduplicated = merge_items_per_day(updated_grouped)
+        print(f"✅ Previous length {len(updated_grouped)}, deduplicated {len(deduplicated)}")
+        write_partitioned(deduplicated, GROUPED_PARQUET_PATH, "part-0.parquet")
+        check_dataset_assets(GROUPED_PARQUET_PATH, deduplicated)
+        print(f"✅ Updated {GROUPED_PARQUET_PATH} with {len(deduplicated)} grouped items.")
     else:
-        updated_grouped = existing_grouped
-    # Add style links to grouped items
-    updated_grouped["links"] = updated_grouped.apply(add_style_link, axis=1)
-    # make sure daily items are merged from previous runs
-    deduplicated = merge_items_per_day(updated_grouped)
-    print(f"✅ Previous length {len(updated_grouped)}, deduplicated {len(deduplicated)}")
-    deduplicated.to_parquet(GROUPED_PARQUET_PATH)
-    print(f"✅ Updated {GROUPED_PARQUET_PATH} with {len(deduplicated)} grouped items.")
-    
-    # copy updated parquet file to flatgeobufs output directory
-    print(f"Copying {GROUPED_PARQUET_PATH} to {FLATGEOBUF_DIR}")
-    shutil.copy(GROUPED_PARQUET_PATH, FLATGEOBUF_DIR)
+        print("✅ No new grouped items to add.")
+
+    # copy updated parquet dataset to flatgeobufs output directory
+    if os.path.exists(GROUPED_PARQUET_PATH):
+        print(f"Copying {GROUPED_PARQUET_PATH} to {FLATGEOBUF_DIR}")
+        publish_dataset(GROUPED_PARQUET_PATH, FLATGEOBUF_DIR)
 
 if __name__ == "__main__":
     import sys